@@ -65,6 +65,22 @@ Professor : Mr. Taghi Ozbeki
 # SECTION1:  IMPORTS
 # =============================================================================
 from datetime import datetime
+from multiprocessing import Pool
+import bisect
+import gzip
+import json
+import os
+import re
+import struct
+import sys
+import zipfile
+
+# pyarrow is optional: with it exports are written as Parquet, without it as NumPy .npz files
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 
 
@@ -77,6 +93,66 @@ total_companies_registered = 0 #Total number of companies registered in the Loca
 total_jobs_posted = 0           #Total number of jobs posted in the LocalWork agency
 total_membership_fee = 0        #Total number of revenue collected from memberships in the LocalWork agency
 
+# Worker schedules are kept in memory as sorted, non-overlapping lists of (start, end) intervals, measured in
+# minutes since Monday 00:00 of a repeating week. Keeping them sorted lets bisect answer
+# "is this worker free" and "does this shift conflict" in O(log n) per worker.
+WEEK_DAYS = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+MAX_WEEKLY_HOURS = 80           #A worker can never be committed to more than this many hours per week
+worker_availability = {}        #worker name (lowercase) -> sorted list of (start, end) when the worker can work
+worker_shifts = {}              #worker name (lowercase) -> sorted list of (start, end, company) committed shifts
+worker_committed_minutes = {}   #worker name (lowercase) -> total minutes of shifts booked each week
+
+# To answer "who is free Tue 9-5" without looking at every worker, all workers' windows are also kept in a
+# segment tree over the minutes of the week. Each window is stored on the O(log T) tree nodes that together
+# cover it, so walking from the root to one minute finds every window containing that minute.
+WEEK_MINUTES = len(WEEK_DAYS) * 24 * 60
+availability_tree = {}          #tree node number -> set of (worker, start, end) windows covering the node's range
+
+# Every LocalWork office is a branch with its own copy of the data files. The original office keeps its files
+# in the program folder (branch MAIN); other offices keep them in branches/<BRANCH ID>/.
+DEFAULT_BRANCH_ID = "MAIN"
+BRANCHES_FOLDER = "branches"
+branch_id = DEFAULT_BRANCH_ID   #Branch this session is running for, written on every record
+branch_folder = "."             #Folder holding this branch's workers.txt, companies.txt, job_post.txt ...
+
+# Record files are rotated into gzip compressed segments (kept in <branch folder>/segments/) once they get
+# too big, or on a new day once they hold enough to be worth compressing. Each segment has a small
+# .index.json next to it, so searching and reporting can skip segments without decompressing them.
+SEGMENTED_FILES = ("workers.txt", "companies.txt", "job_post.txt")
+SEGMENTS_FOLDER = "segments"
+SEGMENT_MAX_BYTES = 1024 * 1024     #Active file is rotated once it reaches this size (1 MB)
+SEGMENT_MIN_BYTES = 64 * 1024       #On a new day the active file is only rotated if it has at least this much (64 KB)
+SEARCH_FIELDS = {                   #Fields whose words are stored in each segment's search index
+    "workers.txt": ["Name", "Skills"],
+    "companies.txt": ["Company Name", "Company Type"],
+    "job_post.txt": ["Company", "Job Position"],
+}
+
+# Every new worker, company and job is also appended to changes.log as one JSON line with an increasing
+# sequence number. Downstream scripts keep a cursor per consumer and only read what was added since.
+# changes.log is rotated into gzip segments the same way as the record files, so it does not grow forever.
+# Only one session at a time should write to a branch: two sessions adding records at the same
+# moment could still give out the same sequence number.
+CHANGE_LOG = "changes.log"
+CURSORS_FOLDER = "change_cursors"
+EXPORT_FOLDER = "export"
+
+# Export tables: table name -> (record file, [(column, record field, "str" or "float"), ...])
+EXPORT_TABLES = {
+    "workers": ("workers.txt", [
+        ("branch", "Branch", "str"), ("name", "Name", "str"), ("phone", "Phone", "str"),
+        ("wage", "Expected Wage", "float"), ("skills", "Skills", "str")]),
+    "companies": ("companies.txt", [
+        ("registration_time", "Registration Time", "str"), ("branch", "Branch", "str"),
+        ("name", "Company Name", "str"), ("type", "Company Type", "str"),
+        ("address", "Company Address", "str"), ("phone", "Company Phone", "str")]),
+    "jobs": ("job_post.txt", [
+        ("posted_timestamp", "Posted Timestamp", "str"), ("branch", "Branch", "str"),
+        ("company", "Company", "str"), ("position", "Job Position", "str"),
+        ("pay_rate", "Pay_Rate", "float"), ("hours_per_week", "Hours Offered Per Week", "float"),
+        ("total_pay_per_week", "Total Pay per Week", "float"), ("start_date", "Start_date", "str")]),
+}
+
 
 
 
@@ -85,6 +161,47 @@ total_membership_fee = 0        #Total number of revenue collected from membersh
 # SECTION 3: DATA PERSISTENCE FUNCTIONS
 # =============================================================================
 
+def branch_folder_for(branch):
+    """
+    Returns the folder that holds a branch's data files.
+    The MAIN branch keeps using the program folder so existing data files still work.
+    :param branch: Branch id, e.g. "MAIN" or "QUEENS"
+    """
+    if branch == DEFAULT_BRANCH_ID:
+        return "."
+    return os.path.join(BRANCHES_FOLDER, branch)
+
+
+def is_valid_branch_id(branch):
+    """
+    Checks that a branch id only uses letters, digits, '-' and '_'.
+    The id becomes a folder name, so anything else (like "../") could point outside the branches folder.
+    """
+    return re.fullmatch(r"[A-Za-z0-9_-]+", branch.strip()) is not None
+
+
+def select_branch(branch):
+    """
+    Points this session at a branch's data files, creating the branch folder on first use.
+    :param branch: Branch id given on the command line
+    :return: None (updates branch_id and branch_folder directly)
+    :raises ValueError: if the branch id is not a valid one
+    """
+    global branch_id, branch_folder
+    if not is_valid_branch_id(branch):
+        raise ValueError(f"Invalid branch id: {branch!r}")
+    branch_id = branch.strip().upper()
+    branch_folder = branch_folder_for(branch_id)
+    os.makedirs(branch_folder, exist_ok=True)
+
+
+def branch_file(filename):
+    """
+    Returns the path of one of the data files (workers.txt, report.txt ...) for the current branch.
+    """
+    return os.path.join(branch_folder, filename)
+
+
 def load_previous_totals():
     """
         Loads cumulative totals from report.txt at program startup.
@@ -97,7 +214,7 @@ def load_previous_totals():
     """
     global total_workers_registered, total_companies_registered, total_jobs_posted, total_membership_fee
     try:
-        with open("report.txt" , 'r') as file:
+        with open(branch_file("report.txt"), 'r') as file:
             # Read file line by line and extract data
             for line in file:
                 line = line.strip()
@@ -151,7 +268,7 @@ def write_report_to_file():
        program sessions since files persist between runs.
     """
 
-    with open("report.txt" ,'w') as file:
+    with open(branch_file("report.txt"),'w') as file:
         # Write header
         file.write(f"\n {'='*70}")
         file.write(f"           LOCALWORK CONNECT - DAILY REPORT\n")
@@ -160,6 +277,7 @@ def write_report_to_file():
         #Write timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         file.write(f"Report Generated : {timestamp} \n")
+        file.write(f"Branch: {branch_id}\n")
         file.write(f"{'=' * 70}\n")
 
         # Write activity Summary
@@ -176,6 +294,305 @@ def write_report_to_file():
         file.write(f"Total Revenue Collected so far : ${total_membership_fee:.2f}\n\n")
 
 
+def load_worker_schedules():
+    """
+        Loads worker availability and committed shifts from schedule.txt at program startup.
+
+        Every entry is inserted back into the in-memory sorted interval lists so that
+        conflict checks during this session see everything booked in earlier sessions.
+        A damaged entry is skipped (and reported) without stopping the entries after it.
+
+        :return: None (updates worker_availability and worker_shifts directly)
+    """
+    try:
+        with open(branch_file("schedule.txt"), 'r') as file:
+            entry = {}
+            for line in file:
+                line = line.strip()
+                if ':' not in line:
+                    continue
+                key, value = line.split(':', 1)
+                entry[key.strip()] = value.strip()
+
+                # "To" is the last field of every entry, so the entry is complete
+                if key.strip() == "To":
+                    try:
+                        start = week_minute(WEEK_DAYS.index(entry["Day"]), parse_clock_time(entry["From"]))
+                        end = week_minute(WEEK_DAYS.index(entry["Day"]), parse_clock_time(entry["To"]))
+                        if end <= start:
+                            raise ValueError("end time is not after start time")
+                        if entry.get("Entry") == "SHIFT":
+                            add_shift(entry["Worker"], start, end, entry.get("Company", ""))
+                        else:
+                            add_availability(entry["Worker"], start, end)
+                    except (ValueError, KeyError):
+                        # Damaged entry (bad day or time, or a missing field)
+                        print(f"\nSkipping damaged schedule entry for {entry.get('Worker', 'unknown worker')}.\n")
+                    entry = {}
+
+    except FileNotFoundError:
+        # No schedules recorded yet
+        pass
+
+
+def write_schedule_entry_to_file(worker_name, entry_type, day, from_time, to_time, company_name=""):
+    """
+    Writes one availability window or committed shift to the schedule.txt file.
+    Appends data so schedules persist between sessions.
+
+    :param worker_name: Worker's full name
+    :param entry_type: "AVAILABLE" or "SHIFT"
+    :param day: Day of the week (MON..SUN)
+    :param from_time: Start time in HH:MM (24 hour)
+    :param to_time: End time in HH:MM (24 hour)
+    :param company_name: Company the shift is for (shifts only)
+    """
+    with open(branch_file("schedule.txt"), "a") as file:
+        file.write(f"\n{'=' * 70}\n")
+        file.write(f"Branch: {branch_id}\n")
+        file.write(f"Worker: {worker_name}\n")
+        file.write(f"Entry: {entry_type}\n")
+        if company_name:
+            file.write(f"Company: {company_name}\n")
+        file.write(f"Day: {day}\n")
+        file.write(f"From: {from_time}\n")
+        file.write(f"To: {to_time}\n")
+        file.write(f"{'=' * 70}\n")
+
+
+
+#=============================================================================
+# SEGMENT ROTATION FUNCTIONS
+# =============================================================================
+
+
+def read_records(text):
+    """
+    Splits the text of a record file into one dictionary per record ("Field: value" lines).
+    A field showing up a second time means the next record has started.
+    """
+    records = []
+    current = None
+    for line in text.splitlines():
+        if ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        key = key.strip()
+        if current is None or key in current:
+            current = {}
+            records.append(current)
+        current[key] = value.strip()
+    return records
+
+
+def search_words(text):
+    """
+    Breaks text into lowercase words, which is how both the segment index and searches compare text.
+    """
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def rotate_file_if_needed(folder, filename):
+    """
+    Closes the active record file into a segment when it has reached SEGMENT_MAX_BYTES,
+    or when it was last written on an earlier day and holds at least SEGMENT_MIN_BYTES.
+
+    Small files are left to grow across days: a few hundred bytes barely compress, and the
+    index would be bigger than the savings. Empty files are never rotated.
+    :param folder: Branch folder holding the file
+    :param filename: One of SEGMENTED_FILES, or CHANGE_LOG
+    """
+    finish_interrupted_rotations(folder, filename)
+
+    path = os.path.join(folder, filename)
+    try:
+        size = os.path.getsize(path)
+        last_written = datetime.fromtimestamp(os.path.getmtime(path))
+    except FileNotFoundError:
+        return
+
+    if size >= SEGMENT_MAX_BYTES:
+        close_segment(folder, filename)
+    elif size >= SEGMENT_MIN_BYTES and last_written.date() < datetime.now().date():
+        close_segment(folder, filename)
+
+
+def close_segment(folder, filename):
+    """
+    Closes the active record file into segments/<name>-<date>-<time>.txt.gz with its index,
+    so the next record starts a fresh active file.
+
+    The active file is first moved into the segments folder in one step (a rename), so its records
+    are never in two places at once. finish_segment() then compresses it and writes the index.
+    If the program stops in between, finish_interrupted_rotations() completes the job later,
+    so records are neither lost nor counted twice.
+    """
+    path = os.path.join(folder, filename)
+    segments_folder = os.path.join(folder, SEGMENTS_FOLDER)
+    os.makedirs(segments_folder, exist_ok=True)
+
+    # Name the segment after the time it was last written to
+    last_written = datetime.fromtimestamp(os.path.getmtime(path))
+    segment_name = f"{filename[:-4]}-{last_written.strftime('%Y%m%d-%H%M%S')}"
+    counter = 1
+    while (os.path.exists(os.path.join(segments_folder, segment_name + ".txt.gz")) or
+           os.path.exists(os.path.join(segments_folder, segment_name + ".txt"))):
+        segment_name = f"{filename[:-4]}-{last_written.strftime('%Y%m%d-%H%M%S')}-{counter}"
+        counter += 1
+
+    os.replace(path, os.path.join(segments_folder, segment_name + ".txt"))
+    finish_segment(segments_folder, filename, segment_name)
+
+
+def finish_segment(segments_folder, filename, segment_name):
+    """
+    Turns an uncompressed segment (<segment_name>.txt) into <segment_name>.txt.gz and its index.
+
+    Both files are written under a temporary name (unique to this process) and then renamed,
+    and the index is renamed last. Readers only look at segments that have an index, so they
+    never see a half written one. If the segment was already finished, nothing is done.
+    """
+    plain_path = os.path.join(segments_folder, segment_name + ".txt")
+    index_path = os.path.join(segments_folder, segment_name + ".index.json")
+    temp_suffix = f".{os.getpid()}.tmp"
+
+    if not os.path.exists(index_path):
+        try:
+            with open(plain_path, 'r') as file:
+                text = file.read()
+            last_written = datetime.fromtimestamp(os.path.getmtime(plain_path))
+        except FileNotFoundError:
+            # Already finished and cleaned up
+            return
+
+        with gzip.open(os.path.join(segments_folder, segment_name + ".txt.gz" + temp_suffix), 'wt') as file:
+            file.write(text)
+        os.replace(os.path.join(segments_folder, segment_name + ".txt.gz" + temp_suffix),
+                   os.path.join(segments_folder, segment_name + ".txt.gz"))
+
+        index = build_segment_index(filename, text, segment_name + ".txt.gz", last_written)
+        with open(index_path + temp_suffix, 'w') as file:
+            json.dump(index, file)
+        os.replace(index_path + temp_suffix, index_path)
+
+    try:
+        os.remove(plain_path)
+    except FileNotFoundError:
+        pass
+
+
+def finish_interrupted_rotations(folder, filename):
+    """
+    Completes any rotation of a record file that was stopped part way,
+    i.e. an uncompressed <name>-<date>-<time>.txt still sitting in the segments folder.
+    Only the session that writes the branch calls this (from rotate_file_if_needed()),
+    so reading and reporting never change files on disk.
+    """
+    segments_folder = os.path.join(folder, SEGMENTS_FOLDER)
+    if not os.path.isdir(segments_folder):
+        return
+
+    for name in sorted(os.listdir(segments_folder)):
+        if name.startswith(filename[:-4] + "-") and name.endswith(".txt"):
+            finish_segment(segments_folder, filename, name[:-4])
+
+
+def build_segment_index(filename, text, segment, last_written):
+    """
+    Builds the small index stored next to a segment.
+
+    :param filename: Record file the segment came from
+    :param text: Uncompressed text of the segment
+    :param segment: File name of the compressed segment
+    :param last_written: datetime the segment was last written to
+    :return: dict with the record count, the searchable words and (for jobs) the job totals;
+             for the change log, the first and last sequence number instead
+    """
+    if filename == CHANGE_LOG:
+        sequences = []
+        for line in text.splitlines():
+            try:
+                sequences.append(json.loads(line)["seq"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        return {"segment": segment, "file": filename, "bytes": len(text),
+                "last_written": last_written.strftime("%Y-%m-%d %H:%M:%S"),
+                "first_seq": min(sequences, default=0), "last_seq": max(sequences, default=0)}
+
+    records = read_job_records(text) if filename == "job_post.txt" else read_records(text)
+
+    words = set()
+    for record in records:
+        for field in SEARCH_FIELDS[filename]:
+            words.update(search_words(record.get(field, "")))
+
+    index = {"segment": segment, "file": filename, "records": len(records), "bytes": len(text),
+             "last_written": last_written.strftime("%Y-%m-%d %H:%M:%S"), "words": sorted(words)}
+    if filename == "job_post.txt":
+        index["job_totals"] = summarize_jobs(records)
+    return index
+
+
+def list_segments(folder, filename):
+    """
+    Returns the indexes of every closed segment of a record file, oldest first.
+    Only the small index files are read; the segments themselves stay compressed.
+    Segments without an index (a rotation still running or stopped part way) are skipped;
+    this function never changes anything on disk.
+    """
+    segments_folder = os.path.join(folder, SEGMENTS_FOLDER)
+    if not os.path.isdir(segments_folder):
+        return []
+
+    names = [name for name in os.listdir(segments_folder)
+             if name.startswith(filename[:-4] + "-") and name.endswith(".index.json")]
+
+    indexes = []
+    for name in sorted(names, key=segment_order):
+        with open(os.path.join(segments_folder, name), 'r') as file:
+            indexes.append(json.load(file))
+    return indexes
+
+
+def segment_order(name):
+    """
+    Sort key that puts segment files oldest first.
+    Names look like <file>-<date>-<time>[-<counter>]; the counter is only added when several
+    segments were closed in the same second, and has to be compared as a number (2 before 10).
+    """
+    parts = name.split(".")[0].split("-")
+    if len(parts) >= 4 and parts[-3].isdigit() and parts[-1].isdigit():
+        # <file>-<date>-<time>-<counter>
+        return parts[-3], parts[-2], int(parts[-1])
+    return parts[-2], parts[-1], 0
+
+
+def read_segment(folder, index):
+    """
+    Decompresses one segment and returns its text.
+    """
+    with gzip.open(os.path.join(folder, SEGMENTS_FOLDER, index["segment"]), 'rt') as file:
+        return file.read()
+
+
+def read_record_file(folder, filename, words=()):
+    """
+    Yields (source name, text) for a record file: its closed segments oldest first, then the active file.
+
+    Segments are only decompressed when they are reached, and when search words are given,
+    segments whose index does not contain all of them are skipped without being opened.
+    """
+    for index in list_segments(folder, filename):
+        if set(words).issubset(index["words"]):
+            yield index["segment"], read_segment(folder, index)
+
+    try:
+        with open(os.path.join(folder, filename), 'r') as file:
+            yield filename, file.read()
+    except FileNotFoundError:
+        pass
+
+
 
 
 # =============================================================================
@@ -275,6 +692,98 @@ def validate_date(prompt):
             print("  Error: Invalid date format. Please use MM/DD/YYYY (e.g., 12/25/2024). \n")
 
 
+def validate_week_day(prompt):
+    """
+    Validates a day of the week (MON, TUE, ... SUN)
+    Accepts full names too (e.g., Tuesday) by looking at the first three letters
+    :param prompt: Message to display to the user
+    :return: The day as a three letter string, e.g. "TUE"
+    """
+    while True:
+        day = input(prompt).strip().upper()[:3]
+        if day in WEEK_DAYS:
+            return day
+        print("  Error: Please enter a day of the week (e.g., Mon, Tue, Wed).\n")
+
+
+def registered_worker_phones(worker_name):
+    """
+    Looks up a name in this branch's worker records.
+    Segments whose index does not contain the name are skipped without being decompressed.
+    :param worker_name: Name to look for (case does not matter)
+    :return: List with the phone number of every registered worker with that name
+    """
+    phones = []
+    for _, text in read_record_file(branch_folder, "workers.txt", search_words(worker_name)):
+        for record in read_records(text):
+            if record.get("Name", "").lower() == worker_name.strip().lower():
+                phones.append(record.get("Phone", ""))
+    return phones
+
+
+def validate_registered_worker():
+    """
+    Asks for the name of a registered worker, so schedules are never created for a typo.
+    When several registered workers share the name, their phone number is asked for as well
+    and becomes part of the name the schedule is kept under, so each gets their own calendar.
+    :return: Name the worker's schedule is kept under, e.g. "Ana" or "Ana (1234567890)"
+    """
+    while True:
+        worker_name = input("Enter worker name: ").strip()
+        if not worker_name or len(worker_name) <= 2:
+            print("  Error: Name must be at least 2 characters. \n")
+            continue
+
+        phones = registered_worker_phones(worker_name)
+        if not phones:
+            print("  Error: No registered worker has that name. Register the worker first (RW).\n")
+            continue
+        if len(phones) == 1:
+            return worker_name
+
+        while True:
+            phone = input(f"{len(phones)} workers are named {worker_name}. Enter this worker's phone number: ").strip()
+            if phone in phones:
+                return f"{worker_name} ({phone})"
+            print("  Error: None of them has that phone number.\n")
+
+
+def parse_clock_time(time_str):
+    """
+    Converts an HH:MM (24 hour) string into minutes after midnight.
+    "24:00" is allowed so a window can run until the end of the day.
+    :param time_str: Time in HH:MM format
+    :return: int minutes after midnight
+    :raises ValueError: if the time is not a valid HH:MM
+    """
+    if time_str.strip() == "24:00":
+        return 24 * 60
+    time_obj = datetime.strptime(time_str.strip(), "%H:%M")
+    return time_obj.hour * 60 + time_obj.minute
+
+
+def validate_time_range(from_prompt, to_prompt):
+    """
+    Validates a start and end time in HH:MM (24 hour) format on the same day.
+    The end time must be after the start time.
+    :return: (from_str, to_str, from_minutes, to_minutes)
+    """
+    while True:
+        from_str = input(from_prompt).strip()
+        to_str = input(to_prompt).strip()
+        try:
+            from_minutes = parse_clock_time(from_str)
+            to_minutes = parse_clock_time(to_str)
+        except ValueError:
+            print("  Error: Invalid time. Please use HH:MM in 24 hour format (e.g., 09:00, 17:30).\n")
+            continue
+
+        if to_minutes <= from_minutes:
+            print("  Error: End time must be after start time.\n")
+            continue
+        return from_str, to_str, from_minutes, to_minutes
+
+
 
 
 
@@ -285,6 +794,7 @@ def validate_date(prompt):
 # 1. Worker Registration
 # 2. Company Registration
 # 3. Job Posting
+# plus worker availability and shift assignment, which keep people from being double-booked
 
 
 #=============================================================================
@@ -393,14 +903,18 @@ def write_worker_to_file(name, phone , wage, skills):
     """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    with open("workers.txt", "a") as file:
+    rotate_file_if_needed(branch_folder, "workers.txt")
+    with open(branch_file("workers.txt"), "a") as file:
         file.write(f"\n{'='*70}\n")
+        file.write(f"Branch: {branch_id}\n")
         file.write(f"Name: {name}\n")
         file.write(f"Phone: {phone }\n")
         file.write(f"Expected Wage: ${wage:.2f}/hour\n")
         file.write(f"Skills: {skills}\n")
         file.write(f"{'='*70}\n")
 
+    record_change("workers", {"branch": branch_id, "name": name, "phone": phone, "wage": wage, "skills": skills})
+
 
 
 #=============================================================================
@@ -488,15 +1002,20 @@ def write_company_to_file(company_name, company_type,company_address,company_pho
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    with open("companies.txt", "a") as file:
+    rotate_file_if_needed(branch_folder, "companies.txt")
+    with open(branch_file("companies.txt"), "a") as file:
         file.write(f"\n{'=' * 70}\n")
         file.write(f"Registration Time: {timestamp} \n")
+        file.write(f"Branch: {branch_id}\n")
         file.write(f"Company Name: {company_name}\n")
         file.write(f"Company Type: {company_type}\n")
         file.write(f"Company Address:{company_address} \n ")
         file.write(f"Company Phone:{company_phone} \n ")
         file.write("=" * 70)
 
+    record_change("companies", {"registration_time": timestamp, "branch": branch_id, "name": company_name,
+                                "type": company_type, "address": company_address, "phone": company_phone})
+
 
 #=============================================================================
 # JOB POSTING FUNCTIONS
@@ -590,9 +1109,11 @@ def write_job_to_file(company_name, job_position, required_skills, pay_rate, hou
     """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    with open("job_post.txt", "a") as file:
+    rotate_file_if_needed(branch_folder, "job_post.txt")
+    with open(branch_file("job_post.txt"), "a") as file:
         file.write(f"\n{'-'*70}\n")
         file.write(f"Posted Timestamp: {timestamp}\n")
+        file.write(f"Branch: {branch_id}\n")
         file.write(f"Company: {company_name}\n")
         file.write(f"Job Position: {job_position}\n")
         file.write(f"Pay_Rate: {pay_rate}\n")
@@ -601,6 +1122,265 @@ def write_job_to_file(company_name, job_position, required_skills, pay_rate, hou
         file.write(f"Start_date: {start_date}\n")
         file.write(f"\n{'-' * 70}\n")
 
+    record_change("jobs", {"posted_timestamp": timestamp, "branch": branch_id, "company": company_name,
+                           "position": job_position, "pay_rate": pay_rate, "hours_per_week": hours_offered_per_week,
+                           "total_pay_per_week": total_pay_per_week, "start_date": start_date})
+
+
+
+#=============================================================================
+# WORKER SCHEDULE FUNCTIONS
+# =============================================================================
+
+
+def week_minute(day_index, minutes_after_midnight):
+    """
+    Converts a day of the week and a time of day into minutes since Monday 00:00.
+    :param day_index: 0 for Monday ... 6 for Sunday
+    :param minutes_after_midnight: Time of day in minutes
+    :return: int minutes since the start of the week
+    """
+    return day_index * 24 * 60 + minutes_after_midnight
+
+
+def format_week_minute(minute):
+    """
+    Converts minutes since Monday 00:00 back into a readable "TUE 09:00" string.
+    """
+    day_index, minutes = divmod(minute, 24 * 60)
+    if day_index == len(WEEK_DAYS):
+        # End of Sunday is stored as the start of the next week
+        return "SUN 24:00"
+    return f"{WEEK_DAYS[day_index]} {minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def add_availability(worker_name, start, end):
+    """
+    Adds an availability window for a worker, merging it with any window it overlaps or touches.
+    The list stays sorted and non-overlapping so later lookups can use bisect.
+    """
+    intervals = worker_availability.setdefault(worker_name.strip().lower(), [])
+
+    # First window that could overlap or touch the new one
+    low = bisect.bisect_left(intervals, (start,))
+    if low > 0 and intervals[low - 1][1] >= start:
+        low -= 1
+
+    # Swallow every window that overlaps the new one
+    high = low
+    while high < len(intervals) and intervals[high][0] <= end:
+        start = min(start, intervals[high][0])
+        end = max(end, intervals[high][1])
+        high += 1
+
+    # Replace the swallowed windows with the merged one, in the worker's list and in the shared tree
+    worker_key = worker_name.strip().lower()
+    for old_start, old_end in intervals[low:high]:
+        update_availability_tree(old_start, old_end, (worker_key, old_start, old_end), False)
+    intervals[low:high] = [(start, end)]
+    update_availability_tree(start, end, (worker_key, start, end), True)
+
+
+def update_availability_tree(start, end, window, add, node=1, low=0, high=WEEK_MINUTES):
+    """
+    Adds (or removes) a window on the tree nodes whose time range lies inside start..end.
+    Only O(log T) nodes are touched, T being the number of minutes in a week.
+    :param window: (worker, start, end) tuple stored on the nodes
+    :param add: True to add the window, False to remove it
+    """
+    if end <= low or high <= start:
+        return
+    if start <= low and high <= end:
+        if add:
+            availability_tree.setdefault(node, set()).add(window)
+        else:
+            availability_tree.get(node, set()).discard(window)
+        return
+
+    middle = (low + high) // 2
+    update_availability_tree(start, end, window, add, 2 * node, low, middle)
+    update_availability_tree(start, end, window, add, 2 * node + 1, middle, high)
+
+
+def windows_covering(minute):
+    """
+    Finds every worker's availability window that contains the given minute of the week.
+    Walks a single root-to-leaf path of the tree, so it costs O(log T + k) for k windows found.
+    :return: List of (worker, start, end) windows
+    """
+    windows = []
+    node, low, high = 1, 0, WEEK_MINUTES
+    while True:
+        windows.extend(availability_tree.get(node, ()))
+        if high - low == 1:
+            return windows
+        middle = (low + high) // 2
+        if minute < middle:
+            node, high = 2 * node, middle
+        else:
+            node, low = 2 * node + 1, middle
+
+
+def add_shift(worker_name, start, end, company_name):
+    """
+    Records a committed shift for a worker, keeping the shift list sorted by start time.
+    Callers are expected to check find_shift_conflict() first.
+    """
+    worker_key = worker_name.strip().lower()
+    shifts = worker_shifts.setdefault(worker_key, [])
+    bisect.insort(shifts, (start, end, company_name))
+    worker_committed_minutes[worker_key] = worker_committed_minutes.get(worker_key, 0) + (end - start)
+
+
+def is_available(worker_name, start, end):
+    """
+    Checks whether one of the worker's availability windows fully covers start..end.
+    Uses bisect to find the last window starting at or before 'start' -- O(log n).
+    :return: True if the worker said they can work the whole time
+    """
+    intervals = worker_availability.get(worker_name.strip().lower(), [])
+    index = bisect.bisect_right(intervals, (start, float('inf'))) - 1
+    return index >= 0 and intervals[index][1] >= end
+
+
+def find_shift_conflict(worker_name, start, end):
+    """
+    Finds a committed shift that overlaps start..end for the worker.
+    Shifts never overlap each other, so only the last shift starting before 'end'
+    can overlap -- a single bisect makes this O(log n).
+    :return: The conflicting (start, end, company) shift, or None if there is no conflict
+    """
+    shifts = worker_shifts.get(worker_name.strip().lower(), [])
+    index = bisect.bisect_left(shifts, (end,)) - 1
+    if index >= 0 and shifts[index][1] > start:
+        return shifts[index]
+    return None
+
+
+def committed_minutes(worker_name):
+    """
+    Returns the total minutes of shifts the worker is committed to each week.
+    The total is kept up to date by add_shift(), so this does not add up the shifts again.
+    """
+    return worker_committed_minutes.get(worker_name.strip().lower(), 0)
+
+
+def check_assignment(worker_name, start, end):
+    """
+    Checks whether a worker can be placed on a shift.
+
+    :return: None if the assignment is fine, otherwise a message explaining why not
+    """
+    if not is_available(worker_name, start, end):
+        return f"{worker_name} is not available {format_week_minute(start)} - {format_week_minute(end)}."
+
+    conflict = find_shift_conflict(worker_name, start, end)
+    if conflict:
+        return (f"{worker_name} is already booked at {conflict[2]} "
+                f"{format_week_minute(conflict[0])} - {format_week_minute(conflict[1])}.")
+
+    if committed_minutes(worker_name) + (end - start) > MAX_WEEKLY_HOURS * 60:
+        return f"{worker_name} would go over {MAX_WEEKLY_HOURS} hours per week."
+
+    return None
+
+
+def find_free_workers(start, end):
+    """
+    Finds every worker who is available for start..end, has no shift booked during it and
+    would stay within MAX_WEEKLY_HOURS -- the same rules check_assignment() applies.
+    Only workers whose window contains 'start' are looked at (found through the availability tree),
+    and each of them costs one bisect for shift conflicts -- O(log T + k log n) instead of
+    going through every registered worker.
+    :return: Sorted list of worker names (lowercase)
+    """
+    return sorted(worker for worker, window_start, window_end in windows_covering(start)
+                  if window_end >= end and find_shift_conflict(worker, start, end) is None
+                  and committed_minutes(worker) + (end - start) <= MAX_WEEKLY_HOURS * 60)
+
+
+def record_worker_availability():
+    """
+    Records when a worker is available to work.
+    Collects the day and time window with validation and saves to file.
+    """
+    print("\n" + "=" * 70)
+    print("WORKER AVAILABILITY")
+
+    worker_name = validate_registered_worker()
+
+    day = validate_week_day("Enter day of the week (e.g., Mon, Tue): ")
+    from_str, to_str, from_minutes, to_minutes = validate_time_range(
+        "Available from (HH:MM, 24 hour): ",
+        "Available until (HH:MM, 24 hour): ")
+
+    day_index = WEEK_DAYS.index(day)
+    add_availability(worker_name, week_minute(day_index, from_minutes), week_minute(day_index, to_minutes))
+    write_schedule_entry_to_file(worker_name, "AVAILABLE", day, from_str, to_str)
+
+    print(f"✅ Availability saved: {worker_name} is available {day} {from_str} - {to_str}\n")
+
+
+def assign_worker_to_shift():
+    """
+    Places a worker on a shift for a company.
+    Refuses the assignment if the worker is not available, is already booked at that time,
+    or would go over the weekly hour limit.
+    """
+    print("\n" + "=" * 70)
+    print("ASSIGN WORKER TO SHIFT")
+
+    worker_name = validate_registered_worker()
+
+    while True:
+        company_name = input("Enter company name for this shift: ").strip()
+        if company_name and len(company_name) > 2:
+            break
+        print(" Error: Company name must be at least 2 characters \n ")
+
+    day = validate_week_day("Enter day of the week (e.g., Mon, Tue): ")
+    from_str, to_str, from_minutes, to_minutes = validate_time_range(
+        "Shift starts (HH:MM, 24 hour): ",
+        "Shift ends (HH:MM, 24 hour): ")
+
+    day_index = WEEK_DAYS.index(day)
+    start = week_minute(day_index, from_minutes)
+    end = week_minute(day_index, to_minutes)
+
+    problem = check_assignment(worker_name, start, end)
+    if problem:
+        print(f"X Cannot assign shift: {problem}\n")
+        return
+
+    add_shift(worker_name, start, end, company_name)
+    write_schedule_entry_to_file(worker_name, "SHIFT", day, from_str, to_str, company_name)
+
+    print(f"✅ {worker_name} assigned to {company_name} on {day} {from_str} - {to_str} "
+          f"({committed_minutes(worker_name) / 60:.1f} hours booked this week)\n")
+
+
+def show_free_workers():
+    """
+    Asks for a day and time window and lists every worker who is free for all of it.
+    """
+    print("\n" + "=" * 70)
+    print("FIND FREE WORKERS")
+
+    day = validate_week_day("Enter day of the week (e.g., Mon, Tue): ")
+    from_str, to_str, from_minutes, to_minutes = validate_time_range(
+        "From (HH:MM, 24 hour): ",
+        "Until (HH:MM, 24 hour): ")
+
+    day_index = WEEK_DAYS.index(day)
+    free_workers = find_free_workers(week_minute(day_index, from_minutes), week_minute(day_index, to_minutes))
+
+    print("-" * 70)
+    print(f"Workers free {day} {from_str} - {to_str}: {len(free_workers)}")
+    print("-" * 70)
+    for worker_name in free_workers:
+        print(f"  {worker_name}")
+    print("-" * 70 + "\n")
+
 
 
 
@@ -608,18 +1388,23 @@ def write_job_to_file(company_name, job_position, required_skills, pay_rate, hou
 # SECTION 6: FILE VIEWING FUNCTION (INCLUDES FOR LOOP - REQUIREMENT!)
 # =============================================================================
 
-def read_file_content(FileChoice:str):
+def read_file_content(FileChoice:str, search=""):
     Filename = FileChoice.strip() + ".txt"
 
     #Check if file is valid
     if (Filename!= "companies.txt" and Filename!= "job_post.txt" and Filename!= "report.txt" and
-            Filename!="workers.txt"):
+            Filename!="workers.txt" and Filename!= "schedule.txt"):
         print("Sorry!, Such file doesnt exist.")
         return
 
+    # Record files may be split into compressed segments, which are read one at a time
+    if Filename in SEGMENTED_FILES:
+        read_segmented_file_content(Filename, search)
+        return
+
     # Try to read and display file
     try:
-        with open(Filename, 'r') as file:
+        with open(branch_file(Filename), 'r') as file:
             file_content = file.read()
 
             # Display file content
@@ -637,8 +1422,531 @@ def read_file_content(FileChoice:str):
         print(f"\n Error reading file: {e}\n")
 
 
+def read_segmented_file_content(Filename, search=""):
+    """
+    Displays a record file that may be split into compressed segments.
+    With a search, only records containing every search word are shown, and segments
+    whose index rules out a match are never decompressed.
+    :param Filename: One of SEGMENTED_FILES
+    :param search: Words to look for (empty shows everything)
+    """
+    words = search_words(search)
+    found = 0
+
+    print("\n" + "=" * 70)
+    print(f"CONTENTS OF {Filename.upper()}" + (f" MATCHING '{search}'" if words else ""))
+    try:
+        for source, text in read_record_file(branch_folder, Filename, words):
+            if not words:
+                print(f"--- {source} ---")
+                print(text)
+                continue
+
+            records = read_job_records(text) if Filename == "job_post.txt" else read_records(text)
+            for record in records:
+                record_words = set()
+                for field in SEARCH_FIELDS[Filename]:
+                    record_words.update(search_words(record.get(field, "")))
+                if set(words).issubset(record_words):
+                    found += 1
+                    print("-" * 70)
+                    for key, value in record.items():
+                        print(f"{key}: {value}")
+
+    except Exception as e:
+        print(f"\n Error reading file: {e}\n")
+
+    if words:
+        print("-" * 70)
+        print(f"Records found: {found}")
+    print("=" * 70 + "\n")
+
+
+
+# =============================================================================
+# SECTION 7: HEAD OFFICE REPORTING FUNCTIONS
+# =============================================================================
+# Head office combines the reports of every branch. Each branch is summarized on its own
+# (in a separate process when there are several), and the small per-branch summaries are merged at the end.
+
+JOB_FIELDS = ["Posted Timestamp", "Branch", "Company", "Job Position", "Pay_Rate", "Hours Offered Per Week",
+              "Total Pay per Week", "Start_date"]
+
+
+def list_branches():
+    """
+    Finds every branch that has data on disk.
+    :return: List of branch ids, MAIN first if the program folder has data files
+    """
+    branches = []
+    if any(os.path.exists(name) for name in ("report.txt", SEGMENTS_FOLDER) + SEGMENTED_FILES):
+        branches.append(DEFAULT_BRANCH_ID)
+
+    if os.path.isdir(BRANCHES_FOLDER):
+        for name in sorted(os.listdir(BRANCHES_FOLDER)):
+            if os.path.isdir(os.path.join(BRANCHES_FOLDER, name)) and name != DEFAULT_BRANCH_ID:
+                branches.append(name)
+    return branches
+
+
+def read_job_records(text):
+    """
+    Splits the text of a job_post.txt file into one dictionary per job.
+    Older job files have every field on one line, so each field name is moved onto its own line first.
+    """
+    for field in JOB_FIELDS:
+        text = text.replace(f"{field}:", f"\n{field}:")
+    return read_records(text)
+
+
+def summarize_jobs(jobs):
+    """
+    Adds up the hours, pay and jobs per company of a list of job records.
+    :param jobs: List of dicts returned by read_job_records()
+    :return: dict with jobs_listed, weekly_hours, weekly_payroll and jobs_by_company
+    """
+    totals = {"jobs_listed": 0, "weekly_hours": 0, "weekly_payroll": 0.0, "jobs_by_company": {}}
+    for job in jobs:
+        totals["jobs_listed"] += 1
+        try:
+            totals["weekly_hours"] += int(float(job.get("Hours Offered Per Week", 0)))
+            totals["weekly_payroll"] += float(job.get("Total Pay per Week", 0))
+        except ValueError:
+            pass
+        company = job.get("Company", "unknown").strip().lower()
+        totals["jobs_by_company"][company] = totals["jobs_by_company"].get(company, 0) + 1
+    return totals
+
+
+def summarize_branch(branch):
+    """
+    Computes the totals of a single branch from its report.txt and job_post.txt.
+
+    This runs inside a worker process during head office reporting, so it only
+    looks at its own branch folder and never touches the global counters.
+
+    :param branch: Branch id
+    :return: dict with the branch's totals
+    """
+    folder = branch_folder_for(branch)
+    summary = {"branches": [branch], "workers": 0, "companies": 0, "jobs": 0, "revenue": 0.0,
+               "jobs_listed": 0, "weekly_hours": 0, "weekly_payroll": 0.0, "jobs_by_company": {}}
+
+    # Registration counts and revenue are kept in the branch's cumulative report
+    try:
+        with open(os.path.join(folder, "report.txt"), 'r') as file:
+            for line in file:
+                line = line.strip()
+                if "Total number of Workers Registered: " in line:
+                    summary["workers"] = int(line.split(':')[1].strip())
+                elif "Total number of Companies Registered: " in line:
+                    summary["companies"] = int(line.split(':')[1].strip())
+                elif "Total number of Jobs posted: " in line:
+                    summary["jobs"] = int(line.split(':')[1].strip())
+                elif "Total Revenue Collected so far :" in line:
+                    summary["revenue"] = float(line.split('$')[1].strip())
+    except FileNotFoundError:
+        pass
+
+    # Payroll and per company rollups come from the job postings themselves. Closed segments
+    # already store their totals in their index, so only the active file has to be parsed.
+    job_totals = [segment["job_totals"] for segment in list_segments(folder, "job_post.txt")]
+    try:
+        with open(os.path.join(folder, "job_post.txt"), 'r') as file:
+            job_totals.append(summarize_jobs(read_job_records(file.read())))
+    except FileNotFoundError:
+        pass
+
+    for totals in job_totals:
+        for key in ("jobs_listed", "weekly_hours", "weekly_payroll"):
+            summary[key] += totals[key]
+        for company, count in totals["jobs_by_company"].items():
+            summary["jobs_by_company"][company] = summary["jobs_by_company"].get(company, 0) + count
+
+    return summary
+
+
+def merge_branch_summaries(summaries):
+    """
+    Adds several branch summaries together into one head office summary.
+    :param summaries: List of dicts returned by summarize_branch()
+    :return: dict with the combined totals
+    """
+    merged = {"branches": [], "workers": 0, "companies": 0, "jobs": 0, "revenue": 0.0,
+              "jobs_listed": 0, "weekly_hours": 0, "weekly_payroll": 0.0, "jobs_by_company": {}}
+
+    for summary in summaries:
+        merged["branches"].extend(summary["branches"])
+        for key in ("workers", "companies", "jobs", "revenue", "jobs_listed", "weekly_hours", "weekly_payroll"):
+            merged[key] += summary[key]
+        for company, count in summary["jobs_by_company"].items():
+            merged["jobs_by_company"][company] = merged["jobs_by_company"].get(company, 0) + count
+    return merged
+
+
+def generate_head_office_report():
+    """
+    Generates the head office report covering every branch and saves it to head_office_report.txt.
+
+    Branches are summarized in a process pool (one process per CPU core), so the time taken
+    grows with the size of the largest branch rather than with all branches combined.
+    """
+    branches = list_branches()
+    if not branches:
+        print("\nNo branch data found. Nothing to report.\n")
+        return
+
+    print(f".........SUMMARIZING {len(branches)} BRANCHES...........")
+    if len(branches) == 1:
+        summaries = [summarize_branch(branches[0])]
+    else:
+        with Pool(min(len(branches), os.cpu_count() or 1)) as pool:
+            summaries = pool.map(summarize_branch, branches)
+
+    totals = merge_branch_summaries(summaries)
+    write_head_office_report_to_file(summaries, totals)
+    print("Head office report saved to head_office_report.txt\n")
+    with open("head_office_report.txt", 'r') as file:
+        print(file.read())
+
+
+def write_head_office_report_to_file(summaries, totals):
+    """
+    Writes the head office report to head_office_report.txt (overwrites existing file).
+
+    :param summaries: Per branch summaries, in branch order
+    :param totals: Combined summary from merge_branch_summaries()
+    """
+    with open("head_office_report.txt", 'w') as file:
+        # Write header
+        file.write(f"{'=' * 70}\n")
+        file.write(f"           LOCALWORK CONNECT - HEAD OFFICE REPORT\n")
+        file.write(f"{'=' * 70}\n")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        file.write(f"Report Generated : {timestamp} \n")
+        file.write(f"Branches Included: {', '.join(totals['branches'])}\n")
+        file.write(f"{'=' * 70}\n")
+
+        # Write one line per branch
+        file.write(f"BRANCH BREAKDOWN\n")
+        file.write(f"{'-' * 70}\n")
+        file.write(f"{'Branch':<14}{'Workers':>9}{'Companies':>11}{'Jobs':>7}{'Revenue':>13}{'Payroll/Week':>16}\n")
+        for summary in summaries:
+            file.write(f"{summary['branches'][0]:<14}{summary['workers']:>9}{summary['companies']:>11}"
+                       f"{summary['jobs']:>7}{summary['revenue']:>13.2f}{summary['weekly_payroll']:>16.2f}\n")
+        file.write(f"{'-' * 70}\n\n")
+
+        # Write totals across all branches
+        file.write(f"ALL BRANCHES SUMMARY\n")
+        file.write(f"{'-' * 70}\n")
+        file.write(f"Total number of Workers Registered: {totals['workers']} \n")
+        file.write(f"Total number of Companies Registered: {totals['companies']} \n")
+        file.write(f"Total number of Jobs posted: {totals['jobs']} \n")
+        file.write(f"Total hours offered per week: {totals['weekly_hours']} \n")
+        file.write(f"Total pay offered per week: ${totals['weekly_payroll']:.2f}\n")
+        file.write(f"Total Revenue Collected so far : ${totals['revenue']:.2f}\n\n")
+
+        # Write jobs per company, busiest first
+        file.write(f"JOBS PER COMPANY\n")
+        file.write(f"{'-' * 70}\n")
+        for company, count in sorted(totals["jobs_by_company"].items(), key=lambda item: (-item[1], item[0])):
+            file.write(f"{company.title():<50}{count:>5}\n")
+        file.write(f"{'=' * 70}\n")
+
+
+# =============================================================================
+# SECTION 8: EXPORT AND CHANGE FEED FUNCTIONS
+# =============================================================================
+# Bookkeeping and analytics scripts should not have to scrape the text files. They can either load a
+# columnar snapshot of every table (export) or follow changes.log with a cursor to get only new records.
+
+
+def read_last_change_sequence(folder):
+    """
+    Finds the sequence number of the newest change of a branch.
+    It is normally the last line of changes.log; right after a rotation, when changes.log
+    is empty or missing, it is the last sequence number in the newest segment's index.
+    :return: int sequence number, 0 if there are no changes yet
+    """
+    sequence = read_tail_change_sequence(os.path.join(folder, CHANGE_LOG))
+    if sequence == 0:
+        segments = list_segments(folder, CHANGE_LOG)
+        if segments:
+            sequence = segments[-1]["last_seq"]
+    return sequence
+
+
+def read_tail_change_sequence(path):
+    """
+    Finds the sequence number of the last complete change in a change log file.
+    The file is read backwards from the end in blocks until a complete line is found,
+    so this stays fast however long the log gets, and still works for very long records.
+    :return: int sequence number, 0 if the file has no complete change
+    """
+    try:
+        with open(path, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+            block_end = file.tell()
+            tail = b""
+            while block_end > 0:
+                block_start = max(0, block_end - 4096)
+                file.seek(block_start)
+                tail = file.read(block_end - block_start) + tail
+                block_end = block_start
+
+                # Unless we reached the start of the file, the first line may be cut in half
+                lines = tail.splitlines()
+                if block_start > 0:
+                    lines = lines[1:]
+                for line in reversed(lines):
+                    try:
+                        return json.loads(line)["seq"]
+                    except (ValueError, KeyError, TypeError):
+                        # Last line may be half written
+                        continue
+    except FileNotFoundError:
+        pass
+    return 0
+
+
+def record_change(table, row):
+    """
+    Appends a new record to changes.log with the next sequence number.
+    The newest sequence number is read from the log right before appending rather than
+    remembered, so a later session never hands out a number that is already used.
+    :param table: "workers", "companies" or "jobs"
+    :param row: dict of the record using the export column names
+    """
+    rotate_file_if_needed(branch_folder, CHANGE_LOG)
+    change = {"seq": read_last_change_sequence(branch_folder) + 1, "table": table,
+              "changed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "record": row}
+    with open(branch_file(CHANGE_LOG), 'a') as file:
+        file.write(json.dumps(change) + "\n")
+
+
+def parse_change_line(line, location):
+    """
+    Decodes one line of the change log.
+    :param line: The line, as bytes or text
+    :param location: Where the line is, used in the message when it is damaged
+    :return: The change dict, or None (after printing a warning) if the line is damaged
+    """
+    try:
+        change = json.loads(line)
+        if isinstance(change, dict) and isinstance(change.get("seq"), int):
+            return change
+    except ValueError:
+        pass
+    print(f"Skipping damaged change at {location}", file=sys.stderr)
+    return None
+
+
+def read_changes(folder, cursor=None):
+    """
+    Reads every change of a branch added after the cursor.
+
+    The cursor remembers which changes.log it stopped in (by the sequence number of its first
+    change) and the byte offset it stopped at, so normally only the new part of changes.log is read.
+    If changes.log was rotated since, the missed changes are read from the segments whose index
+    shows newer sequence numbers; older segments are not decompressed.
+    A damaged line (for example one cut short by a crash) is reported and skipped, so a consumer
+    never gets stuck on it.
+
+    :param folder: Branch folder
+    :param cursor: dict {"seq": ..., "log_start": ..., "offset": ...} returned by the previous call,
+                   or None to start at the beginning
+    :return: (list of change dicts, new cursor)
+    """
+    if cursor is None:
+        cursor = {"seq": 0, "log_start": 0, "offset": 0}
+    sequence = cursor["seq"]
+    changes = []
+    log_start = 0
+    offset = 0
+
+    try:
+        with open(os.path.join(folder, CHANGE_LOG), 'rb') as file:
+            try:
+                log_start = json.loads(file.readline())["seq"]
+            except (ValueError, KeyError, TypeError):
+                log_start = 0
+
+            # Cursors saved before rotation existed have no log_start and always point into changes.log
+            if log_start and cursor.get("log_start", log_start) == log_start:
+                offset = cursor["offset"]
+            else:
+                changes = read_rotated_changes(folder, sequence)
+
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # Change is still being written, it will be picked up next time
+                    break
+                change = parse_change_line(line, f"{CHANGE_LOG} byte offset {offset}")
+                offset += len(line)
+                if change is not None and change["seq"] > (changes[-1]["seq"] if changes else sequence):
+                    changes.append(change)
+
+    except FileNotFoundError:
+        changes = read_rotated_changes(folder, sequence)
+
+    if changes:
+        sequence = changes[-1]["seq"]
+    return changes, {"seq": sequence, "log_start": log_start, "offset": offset}
+
+
+def read_rotated_changes(folder, after_sequence):
+    """
+    Reads the changes newer than after_sequence from the change log's segments.
+    Segments whose index shows nothing newer are skipped without being decompressed. A rotation
+    that was stopped part way leaves a plain segment without an index; it is read as it is.
+    :return: List of change dicts in sequence order
+    """
+    # Unfinished segments are looked at first: if the writing session finishes one while this runs,
+    # its index will then be found below, and the duplicate changes are dropped by sequence number
+    sources = []
+    segments_folder = os.path.join(folder, SEGMENTS_FOLDER)
+    if os.path.isdir(segments_folder):
+        for name in sorted(os.listdir(segments_folder), key=segment_order):
+            if (name.startswith(CHANGE_LOG[:-4] + "-") and name.endswith(".txt") and
+                    not os.path.exists(os.path.join(segments_folder, name[:-4] + ".index.json"))):
+                try:
+                    with open(os.path.join(segments_folder, name), 'r') as file:
+                        sources.append((name, file.read()))
+                except FileNotFoundError:
+                    # Finished by the writing session in the meantime
+                    pass
+
+    for index in list_segments(folder, CHANGE_LOG):
+        if index["last_seq"] > after_sequence:
+            sources.append((index["segment"], read_segment(folder, index)))
+
+    changes_by_sequence = {}
+    for source, text in sources:
+        for number, line in enumerate(text.splitlines(), 1):
+            change = parse_change_line(line, f"{source} line {number}")
+            if change is not None and change["seq"] > after_sequence:
+                changes_by_sequence[change["seq"]] = change
+    return [changes_by_sequence[number] for number in sorted(changes_by_sequence)]
+
+
+def print_changes_for_consumer(consumer):
+    """
+    Prints (as JSON lines) every change the consumer has not seen yet and moves its cursor forward.
+    The cursor is only saved after the changes are printed, so a crash never skips changes.
+    :param consumer: Name of the downstream script, e.g. "bookkeeping"
+    """
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", consumer):
+        print("Consumer name may only contain letters, digits, '-' and '_'.", file=sys.stderr)
+        return
+
+    cursor_path = os.path.join(branch_folder, CURSORS_FOLDER, consumer + ".json")
+    try:
+        with open(cursor_path, 'r') as file:
+            cursor = json.load(file)
+    except FileNotFoundError:
+        cursor = None
+
+    changes, cursor = read_changes(branch_folder, cursor)
+    for change in changes:
+        print(json.dumps(change))
+
+    os.makedirs(os.path.dirname(cursor_path), exist_ok=True)
+    with open(cursor_path, 'w') as file:
+        json.dump(cursor, file)
+
+
+def parse_export_number(value):
+    """
+    Pulls the number out of a field such as "$12.50/hour". Missing numbers become NaN.
+    """
+    match = re.search(r"-?\d+(\.\d+)?", value or "")
+    return float(match.group()) if match else float("nan")
+
+
+def npy_bytes(kind, values):
+    """
+    Encodes one column in NumPy's .npy format so it can be loaded with numpy.load() without
+    NumPy being needed here. Floats are stored as float64, text as fixed width unicode.
+    :param kind: "float" or "str"
+    :param values: List of column values
+    """
+    if kind == "float":
+        descr = "<f8"
+        data = struct.pack(f"<{len(values)}d", *values)
+    else:
+        width = max([len(value) for value in values] + [1])
+        descr = f"<U{width}"
+        data = b"".join(value.ljust(width, "\0").encode("utf-32-le") for value in values)
+
+    # Header is padded so magic + length + header is a multiple of 64 bytes, as the format requires
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, len(values))
+    header += " " * (63 - (10 + len(header)) % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1") + data
+
+
+def write_export_table(folder, table, columns):
+    """
+    Writes one table as workers.parquet (when pyarrow is installed) or workers.npz (one array per column).
+    :param columns: list of (column name, "str" or "float", values)
+    :return: Path of the written file
+    """
+    if pyarrow is not None:
+        path = os.path.join(folder, table + ".parquet")
+        pyarrow.parquet.write_table(pyarrow.table({name: values for name, kind, values in columns}), path)
+        return path
+
+    path = os.path.join(folder, table + ".npz")
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, kind, values in columns:
+            archive.writestr(name + ".npy", npy_bytes(kind, values))
+    return path
+
+
+def export_branch_data():
+    """
+    Exports every worker, company and job of the current branch, plus its totals, to columnar files
+    in <branch folder>/export/.
+
+    The totals table includes change_seq, the newest change included in this export, so a
+    script can load the export once and then follow the change feed from that point.
+    """
+    export_folder = branch_file(EXPORT_FOLDER)
+    os.makedirs(export_folder, exist_ok=True)
+    change_sequence = read_last_change_sequence(branch_folder)
+
+    print(".........EXPORTING BRANCH DATA...........")
+    for table, (filename, fields) in EXPORT_TABLES.items():
+        records = []
+        for _, text in read_record_file(branch_folder, filename):
+            records.extend(read_job_records(text) if filename == "job_post.txt" else read_records(text))
+
+        columns = []
+        for column, field, kind in fields:
+            if kind == "float":
+                values = [parse_export_number(record.get(field)) for record in records]
+            elif field == "Branch":
+                # Records written before branches existed belong to this branch
+                values = [record.get(field, branch_id) for record in records]
+            else:
+                values = [record.get(field, "") for record in records]
+            columns.append((column, kind, values))
+
+        path = write_export_table(export_folder, table, columns)
+        print(f"{table}: {len(records)} records -> {path}")
+
+    summary = summarize_branch(branch_id)
+    totals = [("branch", "str", [branch_id])]
+    for column in ("workers", "companies", "jobs", "revenue", "weekly_hours", "weekly_payroll"):
+        totals.append((column, "float", [float(summary[column])]))
+    totals.append(("change_seq", "float", [float(change_sequence)]))
+    path = write_export_table(export_folder, "totals", totals)
+    print(f"totals: 1 record -> {path}\n")
+
+
+
 # =============================================================================
-# SECTION 7: MENU DISPLAY FUNCTION
+# SECTION 9: MENU DISPLAY FUNCTION
 # =============================================================================
 
 def display_menu():
@@ -649,10 +1957,14 @@ def display_menu():
 
     print("\n" + "="*70)
     print("LOCALWORK CONNECT - COMMUNITY EMPLOYMENT AGENCY")
+    print(f"Branch: {branch_id}")
     print("="*70)
     print("RW. Register Worker")
     print("RC. Register Company")
     print("PJ. Post Job")
+    print("AV. Add Worker Availability")
+    print("AS. Assign Worker to Shift")
+    print("FREE. Find Free Workers")
     print("READ. Display the content of the files")
     print("E.  Exit")
     print("="*70)
@@ -663,7 +1975,7 @@ def display_menu():
 
 
 # =============================================================================
-# SECTION 8: MAIN PROGRAM LOOP
+# SECTION 10: MAIN PROGRAM LOOP
 # =============================================================================
 
 def main():
@@ -678,6 +1990,7 @@ def main():
 
     # Load previous session data from report.txt file
     load_previous_totals()
+    load_worker_schedules()
     try:
         while True:
             display_menu()
@@ -689,10 +2002,19 @@ def main():
                 register_company()
             elif choice == "PJ":
                 post_job()
+            elif choice == "AV":
+                record_worker_availability()
+            elif choice == "AS":
+                assign_worker_to_shift()
+            elif choice == "FREE":
+                show_free_workers()
             elif choice == "READ":
                 FileChoice = input("Enter the exact name of the file you want to access, no need to include "
                                    ".txt:    ").lower()
-                read_file_content(FileChoice)
+                search = ""
+                if FileChoice.strip() + ".txt" in SEGMENTED_FILES:
+                    search = input("Enter words to search for (or press Enter to show everything): ").strip()
+                read_file_content(FileChoice, search)
 
             elif choice == "E":
                 # Exit program - save data first
@@ -715,6 +2037,9 @@ def main():
                 print("RW. Register Worker")
                 print("RC. Register Company")
                 print("PJ. Post Job")
+                print("AV. Add Worker Availability")
+                print("AS. Assign Worker to Shift")
+                print("FREE. Find Free Workers")
                 print("E.  Exit")
 
     except KeyboardInterrupt:
@@ -732,15 +2057,63 @@ def main():
 
 
 # =============================================================================
-# SECTION 9: PROGRAM ENTRY POINT
+# SECTION 11: PROGRAM ENTRY POINT
 # =============================================================================
 
 
-#run the program
-if __name__ == "__main__":
-    main()
+def parse_command_line(arguments):
+    """
+    Reads the command line options.
 
+        python main.py                              runs the MAIN branch
+        python main.py --branch QUEENS              runs the QUEENS branch (data in branches/QUEENS/)
+        python main.py --head-office                writes the report covering every branch
+        python main.py --export                     exports the branch's tables to export/
+        python main.py --changes bookkeeping        prints changes the "bookkeeping" script has not seen yet
 
+    Exits with an error for unknown options, missing values or an invalid branch id,
+    so a typo never silently opens the wrong branch.
 
+    :param arguments: Command line arguments without the program name
+    :return: (branch id, mode, consumer name) where mode is "menu", "head-office", "export" or "changes"
+    """
+    branch = DEFAULT_BRANCH_ID
+    mode = "menu"
+    consumer = ""
+    index = 0
+    while index < len(arguments):
+        if arguments[index] == "--head-office":
+            mode = "head-office"
+        elif arguments[index] == "--export":
+            mode = "export"
+        elif arguments[index] == "--changes" and index + 1 < len(arguments):
+            index += 1
+            mode = "changes"
+            consumer = arguments[index]
+        elif arguments[index] == "--branch" and index + 1 < len(arguments):
+            index += 1
+            branch = arguments[index]
+        else:
+            print(f"Unknown option or missing value: {arguments[index]}", file=sys.stderr)
+            sys.exit(2)
+        index += 1
+
+    if not is_valid_branch_id(branch):
+        print(f"Invalid branch id: {branch!r}. Use only letters, digits, '-' and '_'.", file=sys.stderr)
+        sys.exit(2)
+    return branch, mode, consumer
 
 
+#run the program
+if __name__ == "__main__":
+    chosen_branch, run_mode, consumer_name = parse_command_line(sys.argv[1:])
+    if run_mode == "head-office":
+        generate_head_office_report()
+    else:
+        select_branch(chosen_branch)
+        if run_mode == "export":
+            export_branch_data()
+        elif run_mode == "changes":
+            print_changes_for_consumer(consumer_name)
+        else:
+            main()